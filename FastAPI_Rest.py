@@ -10,25 +10,68 @@ Main Components:
 - User Management: Provides CRUD operations for user data
 - Error Handling: Comprehensive error management for all operations
 - Input Validation: Uses Pydantic models for data validation
+- Content Negotiation: JSON by default, MessagePack on `Accept: application/x-msgpack`
 """
 
-from fastapi import FastAPI, HTTPException, Path
+import hashlib
+import math
+import os
+import sqlite3
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
+import msgpack
+import orjson
+from fastapi import Body, Depends, FastAPI, HTTPException, Path, Request, Response
+from fastapi.responses import ORJSONResponse
 from calculator import Calculator, CalculatorUsers
-from pydantic import BaseModel
-from typing import Dict, Any
+from pydantic import BaseModel, ConfigDict
+from starlette.types import ASGIApp, Receive, Scope, Send
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Union
+
+# Threads available to sync (`def`) handlers; AnyIO defaults to 40
+THREADPOOL_TOKENS = 200
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Application lifespan - Sizes the AnyIO thread pool and opens the user
+    database on startup.
+
+    Every endpoint here is `async def`. Calculator work is trivial and stays
+    on the event loop; the blocking SQLite calls of the user endpoints are
+    offloaded to this pool with `anyio.to_thread.run_sync`. New handlers that
+    block must do the same, or be declared with plain `def` so FastAPI runs
+    them in the pool.
+    """
+    anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_TOKENS
+    global users_db
+    if users_db is None:
+        users_db = CalculatorUsers(os.getenv("USERS_DB_PATH", "users.db"))
+    yield
+
 
 # Initialize FastAPI with metadata
 app = FastAPI(
     title="Calculator API with User Management",
     description="API for basic calculations and user management",
+    default_response_class=ORJSONResponse,  # Serializa com orjson em vez de json
+    lifespan=lifespan,
 )
 
-# Initialize core services
-calc = Calculator()
-users_db = CalculatorUsers()
+# Initialize core services (Calculator is stateless and used via its static methods)
+# Users live in a SQLite file (USERS_DB_PATH, default users.db) so every
+# Uvicorn worker shares them, however the server is started; it is opened by
+# the lifespan on startup rather than at import
+users_db: Optional[CalculatorUsers] = None
 
 # ---- Pydantic Models for Data Validation ----
 
+# Frozen models that reject unknown fields let pydantic-core skip extra-field
+# handling and copies; hot paths build responses with model_construct
+MODEL_CONFIG = ConfigDict(extra="forbid", frozen=True, validate_assignment=False)
+
 
 class UserModel(BaseModel):
     """
@@ -36,6 +79,8 @@ class UserModel(BaseModel):
     Ensures that user data contains required fields in correct format.
     """
 
+    model_config = MODEL_CONFIG
+
     name: str
 
 
@@ -45,6 +90,8 @@ class CalculationResponse(BaseModel):
     Ensures consistent response format across all calculator endpoints.
     """
 
+    model_config = MODEL_CONFIG
+
     result: float
 
 
@@ -52,22 +99,125 @@ class UserResponse(BaseModel):
     """
     Standardized response model for user operations.
     Defines the structure of user data returned by the API.
+
+    Endpoints build it with model_construct, skipping validation: the id and
+    name come from already validated path/body input or from users_db, never
+    straight from an untrusted source.
     """
 
+    model_config = MODEL_CONFIG
+
     id: int
     name: str
 
 
-# ---- Calculator Endpoints ----
+# ---- Content Negotiation ----
 
+MSGPACK_MEDIA_TYPE = "application/x-msgpack"
 
-@app.get("/")
-async def root():
+# Responses differ by Accept, so shared caches must key on it
+VARY_ACCEPT = {"Vary": "Accept"}
+
+
+def _is_refused(params: List[str]) -> bool:
+    """Checks whether Accept media-range params carry q=0"""
+    for param in params:
+        name, _, value = param.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                return float(value) == 0
+            except ValueError:
+                return False
+    return False
+
+
+async def accepts_msgpack(request: Request, response: Response) -> bool:
     """
-    Root endpoint - Provides API information and available endpoints.
-    Similar to DRF's API root router.
+    Dependency - Checks whether the client asked for MessagePack.
+    JSON stays the default, so clients without this Accept header are unaffected.
+    Also marks model responses with Vary: Accept, as negotiated responses are.
+    """
+    response.headers.update(VARY_ACCEPT)
+    for media_range in request.headers.get("accept", "").split(","):
+        media_type, *params = media_range.split(";")
+        if media_type.strip().lower() == MSGPACK_MEDIA_TYPE:
+            return not _is_refused(params)
+    return False
+
+
+def msgpack_response(payload: Dict[str, Any]) -> Response:
+    """Serializes a payload as MessagePack"""
+    return Response(
+        content=msgpack.packb(payload),
+        media_type=MSGPACK_MEDIA_TYPE,
+        headers=VARY_ACCEPT,
+    )
+
+
+def render(payload: Dict[str, Any], as_msgpack: bool) -> Response:
+    """Serializes a payload as MessagePack or JSON, as negotiated"""
+    if as_msgpack:
+        return msgpack_response(payload)
+    return Response(
+        content=orjson.dumps(payload),
+        media_type="application/json",
+        headers=VARY_ACCEPT,
+    )
+
+
+# ---- Prebuilt Error Responses ----
+# Frequent errors are returned as ready-made responses instead of raising
+# HTTPException, skipping the exception handler and re-serialization
+
+_DIV_ZERO = ORJSONResponse(
+    {"detail": "Divisão por zero não é permitido"}, status_code=400
+)
+_USER_NOT_FOUND = ORJSONResponse(
+    {"detail": "User not found: User is not found"}, status_code=404
+)
+_USER_UPDATE_NOT_FOUND = ORJSONResponse(
+    {"detail": "User update failed: User is not found"}, status_code=404
+)
+_USER_DELETE_NOT_FOUND = ORJSONResponse(
+    {"detail": "User deletion failed: User is not found"}, status_code=404
+)
+_USERS_DB_UNAVAILABLE = ORJSONResponse(
+    {"detail": "User database is busy, try again later"}, status_code=503
+)
+
+
+# ---- Operand Parsing ----
+
+# Operands arrive as str for float() parsing but are documented as numbers
+NUMBER_SCHEMA = {"type": "number"}
+
+
+def parse_operands(a: str, b: str) -> Tuple[float, float]:
+    """
+    Converts path operands with float(), bypassing Pydantic's float validator.
+    Raises ValueError for non-numeric or non-finite (nan/inf) operands.
+    """
+    a_val, b_val = float(a), float(b)
+    if not (math.isfinite(a_val) and math.isfinite(b_val)):
+        raise ValueError("operands must be finite numbers")
+    return a_val, b_val
+
+
+def finite(result: float) -> float:
     """
-    return {
+    Guards a calculation result, which JSON would otherwise send as null.
+    Raises ValueError when the result overflowed to inf or is nan.
+    """
+    if not math.isfinite(result):
+        raise ValueError("result is not a finite number")
+    return result
+
+
+# ---- Calculator Endpoints ----
+
+# Static root payload, serialized once at import time
+_ROOT_BYTES = orjson.dumps(
+    {
         "api_name": "Calculator API with User Management",
         "version": "1.0.0",
         "description": "REST API for mathematical operations and user management",
@@ -89,95 +239,176 @@ async def root():
         },
         "status": "online",
     }
+)
+_ROOT_ETAG = f'"{hashlib.sha256(_ROOT_BYTES).hexdigest()}"'
+_ROOT_ETAG_BYTES = _ROOT_ETAG.encode()
+_ROOT_HEADERS = {
+    "ETag": _ROOT_ETAG,
+    "Cache-Control": "public, max-age=3600, immutable",
+}
+_ROOT_RESPONSE = Response(
+    content=_ROOT_BYTES, media_type="application/json", headers=_ROOT_HEADERS
+)
+_ROOT_NOT_MODIFIED = Response(status_code=304, headers=_ROOT_HEADERS)
+
 
+class RootNotModifiedMiddleware:
+    """
+    ASGI middleware - Answers conditional GET/HEAD on `/` with an empty 304.
+
+    Requests whose If-None-Match carries the root ETag (or `*`) never reach the
+    router. Written as plain ASGI rather than @app.middleware("http") so the
+    other routes don't pay for a BaseHTTPMiddleware wrapper.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] == "http"
+            and scope["path"] == "/"
+            and scope["method"] in ("GET", "HEAD")
+        ):
+            for name, value in scope["headers"]:
+                if name == b"if-none-match" and (
+                    value.strip() == b"*" or _ROOT_ETAG_BYTES in value
+                ):
+                    await _ROOT_NOT_MODIFIED(scope, receive, send)
+                    return
+        await self.app(scope, receive, send)
+
+
+app.add_middleware(RootNotModifiedMiddleware)
+
+
+@app.get("/")
+@app.head("/", include_in_schema=False)
+async def root() -> Response:
+    """
+    Root endpoint - Provides API information and available endpoints.
+    Similar to DRF's API root router.
 
-@app.get("/calculator/sum/{a}/{b}", response_model=CalculationResponse)
+    The payload is static, so it is served as a prebuilt response with
+    Cache-Control and ETag headers; revalidation is handled by
+    RootNotModifiedMiddleware.
+    """
+    return _ROOT_RESPONSE
+
+
+@app.get(
+    "/calculator/sum/{a}/{b}",
+    responses={200: {"model": CalculationResponse}},
+)
 async def api_sum(
-    a: float = Path(..., description="First number to sum"),
-    b: float = Path(..., description="Second number to sum"),
-) -> Dict[str, float]:
+    a: str = Path(
+        ..., description="First number to sum", json_schema_extra=NUMBER_SCHEMA
+    ),
+    b: str = Path(
+        ..., description="Second number to sum", json_schema_extra=NUMBER_SCHEMA
+    ),
+    as_msgpack: bool = Depends(accepts_msgpack),
+) -> Response:
     """
     Addition endpoint - Calculates the sum of two numbers.
 
     Flow:
     1. Receives two numbers as path parameters
-    2. Validates input types are float
+    2. Parses inputs with float(), bypassing Pydantic's float validator
     3. Performs addition using calculator service
-    4. Returns result in standardized format
+    4. Returns pre-serialized result, skipping response_model validation
 
     Error Handling:
-    - Catches and formats any calculation errors
+    - Non-numeric or non-finite operands and results raise ValueError
     - Returns 400 status code for invalid inputs
     """
     try:
-        result = calc.sum(a, b)
-        return {"result": result}
-    except Exception as e:
+        result = finite(Calculator.sum(*parse_operands(a, b)))
+        return render({"result": result}, as_msgpack)
+    except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Calculation error: {str(e)}")
 
 
-@app.get("/calculator/subtract/{a}/{b}", response_model=CalculationResponse)
+@app.get(
+    "/calculator/subtract/{a}/{b}",
+    responses={200: {"model": CalculationResponse}},
+)
 async def api_subtract(
-    a: float = Path(..., description="Number to subtract from"),
-    b: float = Path(..., description="Number to subtract"),
-) -> Dict[str, float]:
+    a: str = Path(
+        ..., description="Number to subtract from", json_schema_extra=NUMBER_SCHEMA
+    ),
+    b: str = Path(
+        ..., description="Number to subtract", json_schema_extra=NUMBER_SCHEMA
+    ),
+    as_msgpack: bool = Depends(accepts_msgpack),
+) -> Response:
     """
     Subtraction endpoint - Calculates the difference between two numbers.
 
     Flow:
     1. Receives two numbers as path parameters
-    2. Validates input types are float
+    2. Parses inputs with float(), bypassing Pydantic's float validator
     3. Performs subtraction using calculator service
-    4. Returns result in standardized format
+    4. Returns pre-serialized result, skipping response_model validation
 
     Error Handling:
-    - Catches and formats any calculation errors
+    - Non-numeric or non-finite operands and results raise ValueError
     - Returns 400 status code for invalid inputs
     """
     try:
-        result = calc.substration(a, b)
-        return {"result": result}
-    except Exception as e:
+        result = finite(Calculator.substration(*parse_operands(a, b)))
+        return render({"result": result}, as_msgpack)
+    except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Calculation error: {str(e)}")
 
 
-@app.get("/calculator/divide/{a}/{b}", response_model=CalculationResponse)
+@app.get(
+    "/calculator/divide/{a}/{b}",
+    responses={200: {"model": CalculationResponse}},
+)
 async def api_divide(
-    a: float = Path(..., description="Dividend"),
-    b: float = Path(..., description="Divisor"),
-) -> Dict[str, float]:
+    a: str = Path(..., description="Dividend", json_schema_extra=NUMBER_SCHEMA),
+    b: str = Path(..., description="Divisor", json_schema_extra=NUMBER_SCHEMA),
+    as_msgpack: bool = Depends(accepts_msgpack),
+) -> Response:
     """
     Division endpoint - Divides first number by second number.
 
     Flow:
     1. Receives two numbers as path parameters
-    2. Validates input types are float
-    3. Checks for division by zero
+    2. Parses inputs with float(), bypassing Pydantic's float validator
+    3. Checks for division by zero, returning a prebuilt 400 response
     4. Performs division using calculator service
-    5. Returns result in standardized format
+    5. Returns pre-serialized result, skipping response_model validation
 
     Error Handling:
     - Special handling for division by zero
-    - Catches and formats general calculation errors
+    - Catches and formats non-numeric or non-finite values (ValueError)
     - Returns 400 status code for invalid operations
     """
     try:
-        result = calc.division(a, b)
-        return {"result": result}
-    except ZeroDivisionError:
-        raise HTTPException(status_code=400, detail="Division by zero is not allowed")
-    except Exception as e:
+        dividend, divisor = parse_operands(a, b)
+        if divisor == 0.0:
+            return _DIV_ZERO
+        result = finite(Calculator.division(dividend, divisor))
+        return render({"result": result}, as_msgpack)
+    except ValueError as e:
         raise HTTPException(status_code=400, detail=f"Calculation error: {str(e)}")
 
 
 # ---- User Management Endpoints ----
 
 
-@app.post("/users/{user_id}", response_model=UserResponse)
+@app.post(
+    "/users/{user_id}",
+    response_model=None,
+    responses={200: {"model": UserResponse}},
+)
 async def create_user(
     user_id: int = Path(..., description="User ID"),
-    user: UserModel = Path(..., description="User data"),
-) -> Dict[str, Any]:
+    user: UserModel = Body(..., description="User data"),
+    as_msgpack: bool = Depends(accepts_msgpack),
+) -> Union[UserResponse, Response]:
     """
     User Creation endpoint - Registers a new user in the system.
 
@@ -191,18 +422,28 @@ async def create_user(
     - Validates unique user ID
     - Handles creation failures
     - Returns 400 status code for invalid requests
+    - Returns 503 status code while the database is locked
     """
     try:
-        new_user = users_db.create(user_id, user.name)
-        return new_user
+        new_user = await anyio.to_thread.run_sync(users_db.create, user_id, user.name)
+        if as_msgpack:
+            return msgpack_response(new_user)
+        return UserResponse.model_construct(id=user_id, name=user.name)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=f"User creation failed: {str(e)}")
+    except sqlite3.OperationalError:
+        return _USERS_DB_UNAVAILABLE
 
 
-@app.get("/users/{user_id}", response_model=UserResponse)
+@app.get(
+    "/users/{user_id}",
+    response_model=None,
+    responses={200: {"model": UserResponse}},
+)
 async def get_user(
     user_id: int = Path(..., description="User ID to fetch"),
-) -> Dict[str, Any]:
+    as_msgpack: bool = Depends(accepts_msgpack),
+) -> Union[UserResponse, Response]:
     """
     User Retrieval endpoint - Fetches user information by ID.
 
@@ -214,18 +455,29 @@ async def get_user(
     Error Handling:
     - Handles non-existent user IDs
     - Returns 404 status code for not found users
+    - Returns 503 status code while the database is locked
     """
     try:
-        return users_db.read(user_id)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=f"User not found: {str(e)}")
-
-
-@app.put("/users/{user_id}", response_model=UserResponse)
+        user = await anyio.to_thread.run_sync(users_db.read, user_id)
+        if as_msgpack:
+            return msgpack_response(user)
+        return UserResponse.model_construct(**user)
+    except ValueError:
+        return _USER_NOT_FOUND
+    except sqlite3.OperationalError:
+        return _USERS_DB_UNAVAILABLE
+
+
+@app.put(
+    "/users/{user_id}",
+    response_model=None,
+    responses={200: {"model": UserResponse}},
+)
 async def update_user(
     user_id: int = Path(..., description="User ID to update"),
-    user: UserModel = Path(..., description="Updated user data"),
-) -> Dict[str, Any]:
+    user: UserModel = Body(..., description="Updated user data"),
+    as_msgpack: bool = Depends(accepts_msgpack),
+) -> Union[UserResponse, Response]:
     """
     User Update endpoint - Modifies existing user information.
 
@@ -239,17 +491,26 @@ async def update_user(
     - Handles non-existent user IDs
     - Validates update data
     - Returns 404 status code for not found users
+    - Returns 503 status code while the database is locked
     """
     try:
-        return users_db.update(user_id, user.name)
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=f"User update failed: {str(e)}")
-
-
-@app.delete("/users/{user_id}")
+        updated_user = await anyio.to_thread.run_sync(
+            users_db.update, user_id, user.name
+        )
+        if as_msgpack:
+            return msgpack_response(updated_user)
+        return UserResponse.model_construct(id=user_id, name=user.name)
+    except ValueError:
+        return _USER_UPDATE_NOT_FOUND
+    except sqlite3.OperationalError:
+        return _USERS_DB_UNAVAILABLE
+
+
+@app.delete("/users/{user_id}", response_model=None)
 async def delete_user(
     user_id: int = Path(..., description="User ID to delete"),
-) -> Dict[str, str]:
+    as_msgpack: bool = Depends(accepts_msgpack),
+) -> Union[Dict[str, str], Response]:
     """
     User Deletion endpoint - Removes a user from the system.
 
@@ -261,21 +522,22 @@ async def delete_user(
     Error Handling:
     - Handles non-existent user IDs
     - Returns 404 status code for not found users
+    - Returns 503 status code while the database is locked
     """
     try:
-        users_db.delete(user_id)
+        await anyio.to_thread.run_sync(users_db.delete, user_id)
+        if as_msgpack:
+            return msgpack_response({"message": "User successfully deleted"})
         return {"message": "User successfully deleted"}
-    except ValueError as e:
-        raise HTTPException(status_code=404, detail=f"User deletion failed: {str(e)}")
+    except ValueError:
+        return _USER_DELETE_NOT_FOUND
+    except sqlite3.OperationalError:
+        return _USERS_DB_UNAVAILABLE
 
 
-# API Runtime Configuration
+# API Runtime Configuration (set ENV=dev for auto-reload)
 if __name__ == "__main__":
     import uvicorn
+    from uvicorn_config import config
 
-    uvicorn.run(
-        "FastAPI_Rest:app",
-        host="0.0.0.0",  # Permite acesso externo
-        port=8000,  # Porta que a API vai rodar
-        reload=True,  # Auto-reload quando o código mudar
-    )
+    uvicorn.run(**config)
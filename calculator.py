@@ -1,70 +1,115 @@
+import os
+import sqlite3
+from typing import Union
+
+
 class Calculator:
-    """Add basic operators on calculator"""
+    """Add basic operators on calculator (stateless, so all static)"""
 
-    def sum(self, a: float, b: float):
+    @staticmethod
+    def sum(a: float, b: float) -> float:
         """Sum two numbers"""
         return a + b
 
-    def substration(self, a: float, b: float):
+    @staticmethod
+    def substration(a: float, b: float) -> float:
         """Subtract two numbers"""
         return a - b
 
-    def times(self, a: float, b: float):
+    @staticmethod
+    def times(a: float, b: float) -> float:
         """Multiply a with b"""
         return a * b
 
-    def division(self, a: float, b: float):
-        """Divide a with b, Raises: Se b for zero"""
-        if b == 0:
-            raise ValueError("Divisão por zero não é permitido")
+    @staticmethod
+    def division(a: float, b: float) -> float:
+        """Divide a with b, Raises: ZeroDivisionError se b for zero"""
         return a / b
 
-    def power(self, a: int, b: int):
+    @staticmethod
+    def power(a: int, b: int) -> Union[int, float]:
         """Raise a to power b"""
         return a**b
 
 
 class CalculatorUsers:
-    """Add CRUD to Users"""
+    """Add CRUD to Users, backed by SQLite so every worker process shares them"""
+
+    def __init__(
+        self, path: Union[str, os.PathLike] = ":memory:", timeout: float = 1.0
+    ) -> None:
+        """
+        Initilize User data base, in memory unless a file path is given
+        Raise: sqlite3.OperationalError from CRUD calls if the file stays
+        locked by another writer for longer than timeout seconds
+        """
+        # isolation_level=None autocommits each statement; WAL lets worker
+        # processes read while another one writes
+        self.conn = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS users "
+            "(id INTEGER PRIMARY KEY, name TEXT NOT NULL)"
+        )
 
-    def __init__(self):
-        """Initilize User data base"""
-        self.User = {}
+    @staticmethod
+    def _as_dict(user: tuple[int, str]) -> dict:
+        """Expose a stored (id, name) row as a User dict"""
+        return {"id": user[0], "name": user[1]}
 
     def create(self, id: int, name: str) -> dict:
         """
         Create a User
         Raise: if ID already exist
         """
-        if id in self.User:
+        try:
+            self.conn.execute("INSERT INTO users (id, name) VALUES (?, ?)", (id, name))
+        except sqlite3.IntegrityError:
             raise ValueError("ID already exist")
+        except OverflowError:
+            # SQLite integers are signed 64-bit
+            raise ValueError("ID out of range")
+        return self._as_dict((id, name))
 
-        User = {"id": id, "name": name}
-        self.User[id] = User
-        return User
-
-    def read(self, id: int):
+    def read(self, id: int) -> dict:
         """
         Return a User for ID
         Raise: if User is not found
         """
-        if id not in self.User:
+        try:
+            User = self.conn.execute(
+                "SELECT id, name FROM users WHERE id = ?", (id,)
+            ).fetchone()
+        except OverflowError:
+            # Ids beyond SQLite's signed 64-bit range can't be stored
+            User = None
+        if User is None:
             raise ValueError("User is not found")
-        return self.User[id]
+        return self._as_dict(User)
 
     def update(self, id: int, new_name: str) -> dict:
         """
         Update username
         """
-        if id not in self.User:
+        try:
+            cursor = self.conn.execute(
+                "UPDATE users SET name = ? WHERE id = ?", (new_name, id)
+            )
+        except OverflowError:
             raise ValueError("User is not found")
-        self.User[id]["name"] = new_name
-        return self.User[id]
+        if cursor.rowcount == 0:
+            raise ValueError("User is not found")
+        return self._as_dict((id, new_name))
 
     def delete(self, id: int) -> None:
         """
         Remove User
         """
-        if id not in self.User:
+        try:
+            cursor = self.conn.execute("DELETE FROM users WHERE id = ?", (id,))
+        except OverflowError:
+            raise ValueError("User is not found")
+        if cursor.rowcount == 0:
             raise ValueError("User is not found")
-        del self.User[id]
@@ -1,13 +1,65 @@
 from fastapi.testclient import TestClient
+import msgpack
 import pytest
+import FastAPI_Rest
+from calculator import CalculatorUsers
 from FastAPI_Rest import app
 
 client = TestClient(app)
 
 
+@pytest.fixture(autouse=True)
+def users_db(tmp_path, monkeypatch):
+    """Gives each test a fresh user database file under tmp_path"""
+    db_path = tmp_path / "users.db"
+    db = CalculatorUsers(db_path)
+    monkeypatch.setattr(FastAPI_Rest, "users_db", db)
+    return db
+
+
 class TestCalculatorAPI:
     """Test suite for Calculator API endpoints"""
 
+    def test_root_endpoint(self):
+        """
+        Test root endpoint
+        Ensures API metadata is served cacheable, with an ETag for revalidation
+        """
+        response = client.get("/")
+        assert response.status_code == 200
+        assert response.json()["status"] == "online"
+        assert "max-age=3600" in response.headers["cache-control"]
+        etag = response.headers["etag"]
+
+        response = client.get("/", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+        assert response.content == b""
+
+        response = client.get("/", headers={"If-None-Match": "*"})
+        assert response.status_code == 304
+
+    def test_root_head(self):
+        """
+        Test HEAD on the root endpoint
+        Ensures plain and conditional HEAD behave like GET without a body
+        """
+        response = client.head("/")
+        assert response.status_code == 200
+        assert response.content == b""
+        etag = response.headers["etag"]
+
+        response = client.head("/", headers={"If-None-Match": etag})
+        assert response.status_code == 304
+
+    def test_root_conditional_post_not_allowed(self):
+        """
+        Test conditional POST on the root endpoint
+        Ensures only GET/HEAD revalidation is answered with 304
+        """
+        etag = client.get("/").headers["etag"]
+        response = client.post("/", headers={"If-None-Match": etag})
+        assert response.status_code == 405
+
     def test_addition_endpoint(self):
         """
         Test addition endpoint
@@ -54,3 +106,158 @@ class TestCalculatorAPI:
         response = client.get("/calculator/divide/10/0")
         assert response.status_code == 400
         assert "Divisão por zero não é permitido" in response.json()["detail"]
+
+    def test_invalid_number_endpoint(self):
+        """
+        Test non-numeric path parameters
+        Ensures invalid inputs are rejected with a 400
+        """
+        response = client.get("/calculator/sum/five/3")
+        assert response.status_code == 400
+        assert "Calculation error" in response.json()["detail"]
+
+    def test_operands_documented_as_numbers(self):
+        """
+        Test OpenAPI schema of calculator operands
+        Ensures path operands are still documented as numbers
+        """
+        for operation in ("sum", "subtract", "divide"):
+            path = app.openapi()["paths"][f"/calculator/{operation}/{{a}}/{{b}}"]
+            for parameter in path["get"]["parameters"]:
+                assert parameter["schema"]["type"] == "number"
+
+    def test_non_finite_endpoint(self):
+        """
+        Test non-finite operands and results
+        Ensures nan/inf are rejected with a 400 instead of a null result
+        """
+        for path in (
+            "/calculator/sum/inf/-inf",
+            "/calculator/subtract/nan/1",
+            "/calculator/divide/1/inf",
+            "/calculator/divide/1e308/1e-10",
+            "/calculator/sum/1e308/1e308",
+        ):
+            response = client.get(path)
+            assert response.status_code == 400
+            assert "Calculation error" in response.json()["detail"]
+
+    def test_create_user_endpoint(self):
+        """
+        Test user creation endpoint
+        Ensures the body is read and the created user is returned
+        """
+        response = client.post("/users/1", json={"name": "John Doe"})
+        assert response.status_code == 200
+        assert response.json() == {"id": 1, "name": "John Doe"}
+
+        # Duplicate IDs are rejected
+        response = client.post("/users/1", json={"name": "Jane Doe"})
+        assert response.status_code == 400
+
+    def test_update_user_endpoint(self):
+        """
+        Test user update endpoint
+        Ensures the new name is stored and returned
+        """
+        client.post("/users/1", json={"name": "John Doe"})
+        response = client.put("/users/1", json={"name": "John Smith"})
+        assert response.status_code == 200
+        assert response.json() == {"id": 1, "name": "John Smith"}
+        assert client.get("/users/1").json()["name"] == "John Smith"
+
+        response = client.put("/users/2", json={"name": "John Smith"})
+        assert response.status_code == 404
+
+    def test_user_body_extra_field_rejected(self):
+        """
+        Test user bodies with unknown fields
+        Ensures UserModel forbids extra fields with a 422
+        """
+        response = client.post("/users/1", json={"name": "John Doe", "age": 30})
+        assert response.status_code == 422
+        response = client.put("/users/1", json={"name": "John Doe", "age": 30})
+        assert response.status_code == 422
+
+    def test_user_msgpack_endpoint(self):
+        """
+        Test user endpoints with MessagePack negotiation
+        Ensures create and update answer in msgpack when requested
+        """
+        headers = {"Accept": "application/x-msgpack"}
+        response = client.post("/users/1", json={"name": "John Doe"}, headers=headers)
+        assert response.headers["content-type"] == "application/x-msgpack"
+        assert msgpack.unpackb(response.content) == {"id": 1, "name": "John Doe"}
+
+        response = client.put("/users/1", json={"name": "John Smith"}, headers=headers)
+        assert msgpack.unpackb(response.content) == {"id": 1, "name": "John Smith"}
+
+    def test_get_nonexistent_user_endpoint(self):
+        """
+        Test user lookup for an unknown ID
+        Ensures a 404 with the not found message
+        """
+        response = client.get("/users/-1")
+        assert response.status_code == 404
+        assert response.json() == {"detail": "User not found: User is not found"}
+
+        # Ids beyond SQLite's 64-bit range are simply not found
+        response = client.get("/users/99999999999999999999")
+        assert response.status_code == 404
+        response = client.delete("/users/99999999999999999999")
+        assert response.status_code == 404
+
+    def test_startup_opens_user_database_file(self, tmp_path, monkeypatch):
+        """
+        Test the user database opened on startup
+        Ensures every worker opens the shared file named by USERS_DB_PATH
+        """
+        db_path = tmp_path / "shared.db"
+        monkeypatch.setenv("USERS_DB_PATH", str(db_path))
+        monkeypatch.setattr(FastAPI_Rest, "users_db", None)
+        CalculatorUsers(db_path).create(1, "John Doe")
+
+        with TestClient(app) as startup_client:
+            response = startup_client.get("/users/1")
+        assert response.json() == {"id": 1, "name": "John Doe"}
+
+    def test_locked_user_database_endpoint(self, tmp_path, monkeypatch):
+        """
+        Test user endpoints while another writer holds the database lock
+        Ensures a quick 503 instead of a long stall and a 500
+        """
+        db_path = tmp_path / "locked.db"
+        monkeypatch.setattr(
+            FastAPI_Rest, "users_db", CalculatorUsers(db_path, timeout=0.05)
+        )
+        other = CalculatorUsers(db_path)
+        other.conn.execute("BEGIN IMMEDIATE")
+        try:
+            response = client.delete("/users/1")
+        finally:
+            other.conn.execute("ROLLBACK")
+        assert response.status_code == 503
+
+    def test_msgpack_negotiation(self):
+        """
+        Test MessagePack content negotiation
+        Ensures msgpack is returned only when requested via Accept
+        """
+        response = client.get(
+            "/calculator/sum/5/3", headers={"Accept": "application/x-msgpack"}
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-msgpack"
+        assert msgpack.unpackb(response.content) == {"result": 8.0}
+        assert response.headers["vary"] == "Accept"
+
+        response = client.get("/calculator/sum/5/3")
+        assert response.headers["content-type"] == "application/json"
+        assert response.headers["vary"] == "Accept"
+
+        # q=0 explicitly refuses msgpack
+        response = client.get(
+            "/calculator/sum/5/3",
+            headers={"Accept": "application/x-msgpack;q=0, application/json"},
+        )
+        assert response.headers["content-type"] == "application/json"
@@ -67,6 +67,19 @@ class TestCalculator:
         """Test division operation with various number combinations"""
         assert pytest.approx(calculator.division(a, b)) == expected
 
+    @pytest.mark.parametrize(
+        "a, b, expected",
+        [(2, 3, 8), (5, 0, 1), (2, -1, 0.5), (10, 400, 10**400)],
+    )
+    def test_power(self, calculator, a, b, expected):
+        """Test power operation with non-negative and negative exponents"""
+        assert calculator.power(a, b) == expected
+
+    def test_divide_by_zero(self, calculator):
+        """Test that division by zero raises the native ZeroDivisionError"""
+        with pytest.raises(ZeroDivisionError):
+            calculator.division(1, 0)
+
 
 class TestUserDatabase:
     """Test suite for User Database CRUD operations"""
@@ -123,3 +136,21 @@ class TestUserDatabase:
         """Test that deleting non-existent user raises error"""
         with pytest.raises(ValueError, match="User is not found"):
             db.delete(999)
+
+    def test_nonexistent_user_out_of_range(self, db):
+        """Test that ids beyond SQLite's 64-bit range are reported as not found"""
+        with pytest.raises(ValueError, match="User is not found"):
+            db.read(2**64)
+        with pytest.raises(ValueError, match="User is not found"):
+            db.update(2**64, "John Smith")
+        with pytest.raises(ValueError, match="User is not found"):
+            db.delete(2**64)
+
+    def test_shared_user_database(self, tmp_path):
+        """Test that instances on the same file (one per worker) share users"""
+        from calculator import CalculatorUsers
+
+        first = CalculatorUsers(tmp_path / "u.db")
+        second = CalculatorUsers(tmp_path / "u.db")
+        first.create(1, "John Doe")
+        assert second.read(1) == {"id": 1, "name": "John Doe"}
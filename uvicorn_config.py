@@ -1,10 +1,29 @@
+import os
+import sys
 from typing import Dict, Any
 
-config: Dict[str, Any] = {
+# uvloop does not support Windows; fall back to the asyncio loop there
+LOOP = "uvloop" if sys.platform != "win32" else "asyncio"
+
+# Production settings, used unless ENV=dev
+prod_config: Dict[str, Any] = {
     "app": "FastAPI_Rest:app",
-    "host": "0.0.0.0",
-    "port": 8000,
+    "host": "0.0.0.0",  # Permite acesso externo
+    "port": 8000,  # Porta que a API vai rodar
+    "reload": False,
+    "workers": os.cpu_count() or 1,  # One worker per core
+    "loop": LOOP,  # Event loop em C (uvloop) fora do Windows
+    "http": "httptools",  # Parser HTTP em C
+    "log_level": "info",
+}
+
+# Development settings: auto-reload when the code changes (single process)
+dev_config: Dict[str, Any] = {
+    **prod_config,
     "reload": True,
     "workers": 1,
-    "log_level": "info",
 }
+
+config: Dict[str, Any] = (
+    dev_config if os.getenv("ENV", "prod") == "dev" else prod_config
+)